@@ -6,6 +6,20 @@ class Settings(BaseSettings):
     SUPABASE_SERVICE_ROLE_KEY: str = ""
     SUPABASE_JWT_SECRET: str = ""
     GITHUB_TOKEN: str = ""
+    # Optional read replica. When unset, all reads go to the primary.
+    SUPABASE_READ_URL: str = ""
+    SUPABASE_READ_KEY: str = ""
+    # After a user's own write, their reads stay on the primary this long.
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    # How often the replica's lag is re-measured.
+    REPLICA_LAG_CHECK_SECONDS: float = 5.0
+    # Responses at least this many bytes are gzipped; 0 disables compression.
+    GZIP_MINIMUM_SIZE: int = 1024
+    # How long a stored Idempotency-Key response can be replayed.
+    IDEMPOTENCY_TTL_HOURS: int = 24
+    # An unfinished Idempotency-Key claim older than this may be taken over.
+    # Keep it above the function timeout so a live request is never doubled.
+    IDEMPOTENCY_LEASE_SECONDS: int = 15
 
     model_config = {"env_file": ".env"}
 
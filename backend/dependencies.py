@@ -1,7 +1,10 @@
 import logging
+import math
+import time
 
 import httpx
-from fastapi import HTTPException, Header
+import jwt
+from fastapi import HTTPException, Header, Response
 from supabase import create_client, Client
 
 from backend.config import settings
@@ -20,6 +23,110 @@ def get_supabase_admin() -> Client:
     return _supabase_admin
 
 
+# ------------------------------------------------------------
+# Read/write routing. Writes always go to the primary (the admin client).
+# Reads declare how stale they may be and are served by the replica when it
+# is within that bound and the caller has not written recently.
+#
+# "Recently" travels with the client rather than living in this process:
+# after a mutation the response carries a short-lived signed token in
+# LAST_WRITE_HEADER, and the client sends it back on its next requests.
+# ------------------------------------------------------------
+
+LAST_WRITE_HEADER = "X-Last-Write"
+_LAST_WRITE_AUDIENCE = "gitmarket:last-write"
+
+_supabase_read: Client | None = None
+_replica_lag: tuple[float, float] | None = None  # (measured_at, lag_seconds)
+
+
+def mark_write(response: Response, user_id: str) -> None:
+    """Pin the caller's reads to the primary for ``READ_YOUR_WRITES_SECONDS``."""
+    if not settings.SUPABASE_JWT_SECRET:
+        return
+    token = jwt.encode(
+        {
+            "sub": user_id,
+            "aud": _LAST_WRITE_AUDIENCE,
+            "exp": time.time() + settings.READ_YOUR_WRITES_SECONDS,
+        },
+        settings.SUPABASE_JWT_SECRET,
+        algorithm="HS256",
+    )
+    response.headers[LAST_WRITE_HEADER] = token
+
+
+async def get_wrote_recently(
+    last_write: str | None = Header(None, alias=LAST_WRITE_HEADER),
+) -> bool:
+    """Whether the request carries an unexpired token from ``mark_write``."""
+    if not last_write or not settings.SUPABASE_JWT_SECRET:
+        return False
+    try:
+        jwt.decode(
+            last_write,
+            settings.SUPABASE_JWT_SECRET,
+            algorithms=["HS256"],
+            audience=_LAST_WRITE_AUDIENCE,
+        )
+    except jwt.PyJWTError:
+        return False
+    return True
+
+
+def get_supabase_read(max_staleness: float, wrote_recently: bool = False) -> Client:
+    """Client for a read that tolerates ``max_staleness`` seconds of lag.
+
+    Falls back to the primary when no replica is configured, when the
+    caller wrote within ``READ_YOUR_WRITES_SECONDS`` (see ``mark_write``),
+    or when the replica is lagging by more than ``max_staleness``. Without
+    ``SUPABASE_JWT_SECRET`` writes can't be marked, so reads stay on the
+    primary.
+    """
+    if not settings.SUPABASE_READ_URL or not settings.SUPABASE_JWT_SECRET:
+        return get_supabase_admin()
+    if wrote_recently:
+        return get_supabase_admin()
+    if _replica_lag_seconds() > max_staleness:
+        return get_supabase_admin()
+    return _get_read_client()
+
+
+def _get_read_client() -> Client:
+    global _supabase_read
+    if _supabase_read is None:
+        _supabase_read = create_client(
+            settings.SUPABASE_READ_URL,
+            settings.SUPABASE_READ_KEY or settings.SUPABASE_SERVICE_ROLE_KEY,
+        )
+    return _supabase_read
+
+
+def _replica_lag_seconds() -> float:
+    """Upper bound on the replica's lag right now.
+
+    The lag is re-measured at most every ``REPLICA_LAG_CHECK_SECONDS``.
+    Between checks, the time since the measurement is added, because
+    replication may have stalled just after it. An unreachable replica
+    counts as infinitely stale.
+    """
+    global _replica_lag
+    now = time.monotonic()
+    if _replica_lag is not None:
+        measured_at, lag = _replica_lag
+        if now - measured_at < settings.REPLICA_LAG_CHECK_SECONDS:
+            return lag + (now - measured_at)
+
+    try:
+        lag = _get_read_client().rpc("replica_lag_seconds").execute().data
+    except Exception:
+        logger.warning("Replica lag check failed; routing reads to primary")
+        lag = None
+    lag = math.inf if lag is None else float(lag)
+    _replica_lag = (now, lag)
+    return lag
+
+
 async def get_current_user(
     authorization: str = Header(..., alias="Authorization"),
 ) -> dict:
@@ -41,3 +148,4 @@ async def get_current_user(
 
     user = resp.json()
     return {"id": user["id"], "email": user.get("email")}
+
@@ -1,8 +1,14 @@
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
+from backend.config import settings
 from backend.routers import repos, bounties, wallet
-from backend.dependencies import get_current_user, get_supabase_admin
+from backend.dependencies import (
+    LAST_WRITE_HEADER,
+    get_current_user,
+    get_supabase_admin,
+)
 
 app = FastAPI(title="GitMarket API", version="1.0.0")
 
@@ -12,8 +18,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[LAST_WRITE_HEADER],
 )
 
+if settings.GZIP_MINIMUM_SIZE > 0:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+
 app.include_router(repos.router, prefix="/api")
 app.include_router(bounties.router, prefix="/api")
 app.include_router(wallet.router, prefix="/api")
@@ -1,17 +1,44 @@
-from fastapi import APIRouter, HTTPException, Depends
-
-from backend.dependencies import get_current_user, get_supabase_admin
-from backend.schemas import CreateBountyRequest, CreateSubmissionRequest
+from fastapi import APIRouter, HTTPException, Depends, Header, Response
+from postgrest.exceptions import APIError
+
+from backend.dependencies import (
+    get_current_user,
+    get_supabase_admin,
+    get_supabase_read,
+    get_wrote_recently,
+    mark_write,
+)
+from backend.responses import FastJSONResponse
+from backend.schemas import (
+    BountyOut,
+    BulkModerationRequest,
+    CreateBountyRequest,
+    CreateSubmissionRequest,
+    select_columns,
+)
+from backend.services.idempotency import run_idempotent
 
 router = APIRouter(prefix="/bounties", tags=["bounties"])
 
 
-@router.get("")
-async def list_bounties():
-    sb = get_supabase_admin()
+def _rule_violation(e: APIError) -> bool:
+    """Whether a PostgREST error is a rule the database enforced.
+
+    RAISE EXCEPTION (P0), bad input (22) and constraint violations (23)
+    fail the same way on retry. Anything else, such as a connection or
+    statement timeout, is transient and must not become a 4xx.
+    """
+    return (e.code or "").startswith(("P0", "22", "23"))
+
+
+@router.get(
+    "", response_model=list[BountyOut], response_class=FastJSONResponse
+)
+async def list_bounties(wrote_recently: bool = Depends(get_wrote_recently)):
+    sb = get_supabase_read(max_staleness=30, wrote_recently=wrote_recently)
     result = (
         sb.table("bounties")
-        .select("*, repos(*), profiles(*)")
+        .select(select_columns(BountyOut))
         .eq("status", "open")
         .order("created_at", desc=True)
         .execute()
@@ -20,8 +47,10 @@ async def list_bounties():
 
 
 @router.get("/{bounty_id}")
-async def get_bounty(bounty_id: int):
-    sb = get_supabase_admin()
+async def get_bounty(
+    bounty_id: int, wrote_recently: bool = Depends(get_wrote_recently)
+):
+    sb = get_supabase_read(max_staleness=5, wrote_recently=wrote_recently)
     bounty_result = (
         sb.table("bounties")
         .select("*, repos(*), profiles(*)")
@@ -48,8 +77,23 @@ async def get_bounty(bounty_id: int):
 
 @router.post("")
 async def create_bounty(
-    body: CreateBountyRequest, user: dict = Depends(get_current_user)
+    body: CreateBountyRequest,
+    response: Response,
+    user: dict = Depends(get_current_user),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
 ):
+    result = await run_idempotent(
+        user["id"],
+        idempotency_key,
+        "create_bounty",
+        body.model_dump(),
+        lambda: _create_bounty(body, user),
+    )
+    mark_write(response, user["id"])
+    return result
+
+
+def _create_bounty(body: CreateBountyRequest, user: dict) -> dict:
     if body.amount < 5:
         raise HTTPException(status_code=400, detail="Minimum bounty is $5")
 
@@ -68,7 +112,9 @@ async def create_bounty(
             },
         ).execute()
         bounty_id = result.data
-    except Exception as e:
+    except APIError as e:
+        if not _rule_violation(e):
+            raise
         msg = str(e)
         if "Insufficient balance" in msg:
             raise HTTPException(status_code=400, detail="Insufficient balance")
@@ -78,37 +124,42 @@ async def create_bounty(
 
 
 @router.delete("/{bounty_id}")
-async def cancel_bounty(bounty_id: int, user: dict = Depends(get_current_user)):
-    sb = get_supabase_admin()
-
-    bounty = (
-        sb.table("bounties").select("*").eq("id", bounty_id).single().execute()
+async def cancel_bounty(
+    bounty_id: int,
+    response: Response,
+    user: dict = Depends(get_current_user),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+):
+    result = await run_idempotent(
+        user["id"],
+        idempotency_key,
+        f"cancel_bounty:{bounty_id}",
+        None,
+        lambda: _cancel_bounty(bounty_id, user),
     )
-    if not bounty.data:
-        raise HTTPException(status_code=404, detail="Bounty not found")
-    if bounty.data["creator_id"] != user["id"]:
-        raise HTTPException(status_code=403, detail="Not your bounty")
-    if bounty.data["status"] != "open":
-        raise HTTPException(status_code=400, detail="Bounty is not open")
-
-    amount = bounty.data["amount"]
+    mark_write(response, user["id"])
+    return result
 
-    # Refund
-    sb.table("profiles").update(
-        {"balance": sb.table("profiles").select("balance").eq("id", user["id"]).single().execute().data["balance"] + amount}
-    ).eq("id", user["id"]).execute()
 
-    sb.table("bounties").update({"status": "cancelled"}).eq("id", bounty_id).execute()
+def _cancel_bounty(bounty_id: int, user: dict) -> dict:
+    sb = get_supabase_admin()
 
-    sb.table("transactions").insert(
-        {
-            "user_id": user["id"],
-            "amount": amount,
-            "type": "bounty_cancelled",
-            "bounty_id": bounty_id,
-            "description": f"Cancelled bounty on {bounty.data['issue_title']}",
-        }
-    ).execute()
+    try:
+        sb.rpc(
+            "cancel_bounty",
+            {"p_canceller_id": user["id"], "p_bounty_id": bounty_id},
+        ).execute()
+    except APIError as e:
+        if not _rule_violation(e):
+            raise
+        msg = str(e)
+        if "Bounty not found" in msg:
+            raise HTTPException(status_code=404, detail="Bounty not found")
+        if "Not your bounty" in msg:
+            raise HTTPException(status_code=403, detail="Not your bounty")
+        if "Bounty is not open" in msg:
+            raise HTTPException(status_code=400, detail="Bounty is not open")
+        raise HTTPException(status_code=400, detail=msg)
 
     return {"ok": True}
 
@@ -117,6 +168,7 @@ async def cancel_bounty(bounty_id: int, user: dict = Depends(get_current_user)):
 async def create_submission(
     bounty_id: int,
     body: CreateSubmissionRequest,
+    response: Response,
     user: dict = Depends(get_current_user),
 ):
     sb = get_supabase_admin()
@@ -153,6 +205,7 @@ async def create_submission(
             )
         raise
 
+    mark_write(response, user["id"])
     return result.data[0]
 
 
@@ -160,8 +213,24 @@ async def create_submission(
 async def approve_submission(
     bounty_id: int,
     submission_id: int,
+    response: Response,
     user: dict = Depends(get_current_user),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
 ):
+    result = await run_idempotent(
+        user["id"],
+        idempotency_key,
+        f"approve_submission:{bounty_id}:{submission_id}",
+        None,
+        lambda: _approve_submission(bounty_id, submission_id, user),
+    )
+    mark_write(response, user["id"])
+    return result
+
+
+def _approve_submission(
+    bounty_id: int, submission_id: int, user: dict
+) -> dict:
     sb = get_supabase_admin()
 
     try:
@@ -173,7 +242,9 @@ async def approve_submission(
                 "p_submission_id": submission_id,
             },
         ).execute()
-    except Exception as e:
+    except APIError as e:
+        if not _rule_violation(e):
+            raise
         raise HTTPException(status_code=400, detail=str(e))
 
     return {"ok": True}
@@ -183,6 +254,7 @@ async def approve_submission(
 async def reject_submission(
     bounty_id: int,
     submission_id: int,
+    response: Response,
     user: dict = Depends(get_current_user),
 ):
     sb = get_supabase_admin()
@@ -195,8 +267,47 @@ async def reject_submission(
     if bounty.data["creator_id"] != user["id"]:
         raise HTTPException(status_code=403, detail="Only the creator can reject")
 
-    sb.table("submissions").update({"status": "rejected"}).eq(
-        "id", submission_id
-    ).execute()
+    result = (
+        sb.table("submissions")
+        .update({"status": "rejected"})
+        .eq("id", submission_id)
+        .eq("bounty_id", bounty_id)
+        .execute()
+    )
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Submission not found")
 
+    mark_write(response, user["id"])
     return {"ok": True}
+
+
+@router.post("/{bounty_id}/submissions/bulk")
+async def moderate_submissions(
+    bounty_id: int,
+    body: BulkModerationRequest,
+    response: Response,
+    user: dict = Depends(get_current_user),
+):
+    sb = get_supabase_admin()
+
+    try:
+        result = sb.rpc(
+            "moderate_submissions",
+            {
+                "p_moderator_id": user["id"],
+                "p_bounty_id": bounty_id,
+                "p_actions": [a.model_dump() for a in body.actions],
+            },
+        ).execute()
+    except APIError as e:
+        if not _rule_violation(e):
+            raise
+        msg = str(e)
+        if "Bounty not found" in msg:
+            raise HTTPException(status_code=404, detail="Bounty not found")
+        if "Only the bounty creator" in msg:
+            raise HTTPException(status_code=403, detail="Only the creator can moderate")
+        raise HTTPException(status_code=400, detail=msg)
+
+    mark_write(response, user["id"])
+    return {"results": result.data}
@@ -1,13 +1,49 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
 
-from backend.dependencies import get_supabase_admin
-from backend.services.github import parse_github_url, fetch_repo, fetch_issues
+from backend.dependencies import (
+    get_supabase_admin,
+    get_supabase_read,
+    get_wrote_recently,
+)
+from backend.responses import FastJSONResponse
+from backend.schemas import (
+    BatchRepoRequest,
+    BatchRepoResponse,
+    BountyRef,
+    RepoSearchResponse,
+    select_columns,
+)
+from backend.services.github import (
+    parse_github_url,
+    fetch_repo,
+    fetch_issues,
+    fetch_repos_batch,
+)
 
 router = APIRouter(prefix="/repos", tags=["repos"])
 
 
-@router.get("/search")
-async def search_repo(url: str = Query(...)):
+def _repo_row(owner: str, name: str, gh_repo: dict) -> dict:
+    return {
+        "github_id": gh_repo["id"],
+        "owner": owner.lower(),
+        "name": name.lower(),
+        "full_name": gh_repo["full_name"],
+        "description": gh_repo.get("description"),
+        "stars": gh_repo.get("stargazers_count", 0),
+        "language": gh_repo.get("language"),
+        "url": gh_repo["html_url"],
+    }
+
+
+@router.get(
+    "/search",
+    response_model=RepoSearchResponse,
+    response_class=FastJSONResponse,
+)
+async def search_repo(
+    url: str = Query(...), wrote_recently: bool = Depends(get_wrote_recently)
+):
     try:
         owner, name = parse_github_url(url)
     except ValueError:
@@ -21,19 +57,9 @@ async def search_repo(url: str = Query(...)):
     sb = get_supabase_admin()
 
     # Upsert the repo
-    repo_data = {
-        "github_id": gh_repo["id"],
-        "owner": owner.lower(),
-        "name": name.lower(),
-        "full_name": gh_repo["full_name"],
-        "description": gh_repo.get("description"),
-        "stars": gh_repo.get("stargazers_count", 0),
-        "language": gh_repo.get("language"),
-        "url": gh_repo["html_url"],
-    }
     result = (
         sb.table("repos")
-        .upsert(repo_data, on_conflict="github_id")
+        .upsert(_repo_row(owner, name, gh_repo), on_conflict="github_id")
         .execute()
     )
     repo = result.data[0]
@@ -46,37 +72,95 @@ async def search_repo(url: str = Query(...)):
 
     # Get existing bounties for this repo
     bounties_result = (
-        sb.table("bounties")
-        .select("*")
+        get_supabase_read(max_staleness=30, wrote_recently=wrote_recently)
+        .table("bounties")
+        .select(select_columns(BountyRef))
         .eq("repo_id", repo["id"])
         .eq("status", "open")
         .execute()
     )
-    bounty_map = {}
-    for b in bounties_result.data:
-        bounty_map[b["issue_number"]] = b
+    bounty_map = {b["issue_number"]: b for b in bounties_result.data}
 
-    # Enrich issues with bounty data
-    issues = []
+    # Attach bounty data; RepoSearchResponse projects the GitHub payload
+    # down to the fields we expose.
     for issue in gh_issues:
-        issues.append(
-            {
-                "number": issue["number"],
-                "title": issue["title"],
-                "html_url": issue["html_url"],
-                "state": issue["state"],
-                "labels": [
-                    {"name": l["name"], "color": l.get("color", "ccc")}
-                    for l in issue.get("labels", [])
-                ],
-                "user": {
-                    "login": issue["user"]["login"],
-                    "avatar_url": issue["user"]["avatar_url"],
-                },
-                "created_at": issue["created_at"],
-                "comments": issue.get("comments", 0),
-                "bounty": bounty_map.get(issue["number"]),
-            }
+        issue["bounty"] = bounty_map.get(issue["number"])
+
+    return {"repo": repo, "issues": gh_issues}
+
+
+@router.post(
+    "/batch",
+    response_model=BatchRepoResponse,
+    response_class=FastJSONResponse,
+)
+async def batch_repos(
+    body: BatchRepoRequest, wrote_recently: bool = Depends(get_wrote_recently)
+):
+    results = [{"query": q} for q in body.repos]
+
+    # Parse and dedupe; each unique owner/name is looked up once
+    keys: list[tuple[str, str]] = []
+    key_index: dict[tuple[str, str], int] = {}
+    result_keys: list[int | None] = []
+    for result in results:
+        try:
+            owner, name = parse_github_url(result["query"])
+        except ValueError:
+            result["error"] = "Invalid GitHub URL"
+            result_keys.append(None)
+            continue
+        key = (owner.lower(), name.lower())
+        if key not in key_index:
+            key_index[key] = len(keys)
+            keys.append(key)
+        result_keys.append(key_index[key])
+
+    fetched = await fetch_repos_batch(keys) if keys else []
+
+    # Upsert every repo found on GitHub in one statement
+    rows = {}
+    for (owner, name), item in zip(keys, fetched):
+        if isinstance(item, tuple):
+            row = _repo_row(owner, name, item[0])
+            rows[row["github_id"]] = row
+
+    sb = get_supabase_admin()
+    repos_by_github_id = {}
+    bounty_map = {}
+    if rows:
+        upserted = (
+            sb.table("repos")
+            .upsert(list(rows.values()), on_conflict="github_id")
+            .execute()
+        )
+        repos_by_github_id = {r["github_id"]: r for r in upserted.data}
+
+        bounties_result = (
+            get_supabase_read(max_staleness=30, wrote_recently=wrote_recently)
+            .table("bounties")
+            .select(select_columns(BountyRef) + ",repo_id")
+            .in_("repo_id", [r["id"] for r in upserted.data])
+            .eq("status", "open")
+            .execute()
         )
+        bounty_map = {
+            (b["repo_id"], b["issue_number"]): b for b in bounties_result.data
+        }
+
+    for result, key in zip(results, result_keys):
+        if key is None:
+            continue
+        item = fetched[key]
+        if isinstance(item, str):
+            result["error"] = item
+            continue
+        gh_repo, gh_issues = item
+        repo = repos_by_github_id[gh_repo["id"]]
+        result["repo"] = repo
+        result["issues"] = [
+            {**issue, "bounty": bounty_map.get((repo["id"], issue["number"]))}
+            for issue in gh_issues
+        ]
 
-    return {"repo": repo, "issues": issues}
+    return {"results": results}
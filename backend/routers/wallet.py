@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends
 
 from backend.dependencies import get_current_user, get_supabase_admin
+from backend.responses import FastJSONResponse
+from backend.schemas import TransactionOut, WalletResponse, select_columns
 
 router = APIRouter(prefix="/wallet", tags=["wallet"])
 
 
-@router.get("")
+@router.get("", response_model=WalletResponse, response_class=FastJSONResponse)
 async def get_wallet(user: dict = Depends(get_current_user)):
     sb = get_supabase_admin()
 
@@ -19,7 +21,7 @@ async def get_wallet(user: dict = Depends(get_current_user)):
 
     transactions = (
         sb.table("transactions")
-        .select("*")
+        .select(select_columns(TransactionOut))
         .eq("user_id", user["id"])
         .order("created_at", desc=True)
         .execute()
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import Literal, get_args
+
+from pydantic import BaseModel, Field
 
 
 class CreateBountyRequest(BaseModel):
@@ -12,3 +14,138 @@ class CreateBountyRequest(BaseModel):
 class CreateSubmissionRequest(BaseModel):
     pr_url: str
     comment: str | None = None
+
+
+class ModerationAction(BaseModel):
+    submission_id: int
+    action: Literal["approve", "reject"]
+
+
+class BulkModerationRequest(BaseModel):
+    actions: list[ModerationAction] = Field(..., min_length=1, max_length=100)
+
+
+# ------------------------------------------------------------
+# Lean response models for list endpoints. Only the fields the
+# frontend reads are declared; select_columns() turns a model into
+# the matching PostgREST select so unused columns never leave the DB.
+# ------------------------------------------------------------
+
+
+class ProfileSummary(BaseModel):
+    id: str
+    username: str | None = None
+    avatar_url: str | None = None
+
+
+class RepoSummary(BaseModel):
+    id: int
+    owner: str
+    name: str
+    full_name: str
+
+
+class RepoOut(RepoSummary):
+    github_id: int
+    description: str | None = None
+    stars: int = 0
+    language: str | None = None
+    url: str
+    created_at: str
+
+
+class BountyRef(BaseModel):
+    id: int
+    issue_number: int
+    creator_id: str
+    amount: int
+    status: str
+
+
+class BountyOut(BountyRef):
+    repo_id: int
+    issue_title: str
+    issue_url: str
+    created_at: str
+    repos: RepoSummary | None = None
+    profiles: ProfileSummary | None = None
+
+
+class TransactionOut(BaseModel):
+    id: int
+    amount: int
+    type: str
+    bounty_id: int | None = None
+    description: str | None = None
+    created_at: str
+
+
+class WalletResponse(BaseModel):
+    balance: int
+    transactions: list[TransactionOut]
+
+
+class IssueLabel(BaseModel):
+    name: str
+    color: str = "ccc"
+
+
+class IssueUser(BaseModel):
+    login: str
+    avatar_url: str
+
+
+class IssueOut(BaseModel):
+    number: int
+    title: str
+    html_url: str
+    state: str
+    labels: list[IssueLabel] = []
+    user: IssueUser
+    created_at: str
+    comments: int = 0
+    bounty: BountyRef | None = None
+
+
+class RepoSearchResponse(BaseModel):
+    repo: RepoOut
+    issues: list[IssueOut]
+
+
+def select_columns(model: type[BaseModel]) -> str:
+    """Build a PostgREST select string from a model's fields.
+
+    Fields typed as another model (optionally ``| None``) become embedded
+    resources, e.g. ``BountyOut`` -> ``"id,...,repos(id,owner,...)"``.
+    """
+    columns = []
+    for name, field in model.model_fields.items():
+        nested = _nested_model(field.annotation)
+        if nested is not None:
+            columns.append(f"{name}({select_columns(nested)})")
+        else:
+            columns.append(name)
+    return ",".join(columns)
+
+
+def _nested_model(annotation) -> type[BaseModel] | None:
+    candidates = get_args(annotation) or (annotation,)
+    for c in candidates:
+        if isinstance(c, type) and issubclass(c, BaseModel):
+            return c
+    return None
+
+
+class BatchRepoRequest(BaseModel):
+    repos: list[str] = Field(..., min_length=1, max_length=50)
+
+
+class BatchRepoResult(BaseModel):
+    query: str
+    repo: RepoOut | None = None
+    issues: list[IssueOut] = []
+    error: str | None = None
+
+
+class BatchRepoResponse(BaseModel):
+    results: list[BatchRepoResult]
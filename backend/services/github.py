@@ -1,3 +1,4 @@
+import asyncio
 import re
 
 import httpx
@@ -45,3 +46,124 @@ async def fetch_issues(owner: str, name: str) -> list[dict]:
         )
         resp.raise_for_status()
         return [i for i in resp.json() if "pull_request" not in i]
+
+
+GRAPHQL_BATCH_SIZE = 25
+
+_REPO_FIELDS = """
+    databaseId
+    nameWithOwner
+    description
+    stargazerCount
+    url
+    primaryLanguage { name }
+    issues(states: OPEN, first: 30, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      nodes {
+        number
+        title
+        url
+        state
+        createdAt
+        comments { totalCount }
+        author { login avatarUrl }
+        labels(first: 20) { nodes { name color } }
+      }
+    }
+"""
+
+
+def _repo_from_graphql(node: dict) -> dict:
+    """Reshape a GraphQL repository node into the REST payload shape."""
+    return {
+        "id": node["databaseId"],
+        "full_name": node["nameWithOwner"],
+        "description": node.get("description"),
+        "stargazers_count": node.get("stargazerCount", 0),
+        "language": (node.get("primaryLanguage") or {}).get("name"),
+        "html_url": node["url"],
+    }
+
+
+def _issue_from_graphql(node: dict) -> dict:
+    """Reshape a GraphQL issue node into the REST payload shape."""
+    author = node.get("author") or {"login": "ghost", "avatarUrl": ""}
+    return {
+        "number": node["number"],
+        "title": node["title"],
+        "html_url": node["url"],
+        "state": node["state"].lower(),
+        "labels": node["labels"]["nodes"],
+        "user": {"login": author["login"], "avatar_url": author["avatarUrl"]},
+        "created_at": node["createdAt"],
+        "comments": node["comments"]["totalCount"],
+    }
+
+
+async def _fetch_repos_chunk(
+    client: httpx.AsyncClient, repos: list[tuple[str, str]]
+) -> list[tuple[dict, list[dict]] | str]:
+    params = ", ".join(
+        f"$o{i}: String!, $n{i}: String!" for i in range(len(repos))
+    )
+    fields = "\n".join(
+        f"r{i}: repository(owner: $o{i}, name: $n{i}) {{{_REPO_FIELDS}}}"
+        for i in range(len(repos))
+    )
+    variables = {}
+    for i, (owner, name) in enumerate(repos):
+        variables[f"o{i}"] = owner
+        variables[f"n{i}"] = name
+
+    resp = await client.post(
+        f"{GITHUB_API}/graphql",
+        headers=_headers(),
+        json={"query": f"query({params}) {{\n{fields}\n}}", "variables": variables},
+    )
+    resp.raise_for_status()
+    payload = resp.json()
+
+    errors = {}
+    for err in payload.get("errors") or []:
+        path = err.get("path") or []
+        if path:
+            errors.setdefault(path[0], err.get("message", "GitHub error"))
+    data = payload.get("data") or {}
+
+    results = []
+    for i in range(len(repos)):
+        node = data.get(f"r{i}")
+        if node is None:
+            results.append(errors.get(f"r{i}", "Repository not found on GitHub"))
+            continue
+        issues = [_issue_from_graphql(n) for n in node["issues"]["nodes"]]
+        results.append((_repo_from_graphql(node), issues))
+    return results
+
+
+async def fetch_repos_batch(
+    repos: list[tuple[str, str]],
+) -> list[tuple[dict, list[dict]] | str]:
+    """Fetch many repos and their open issues via the GraphQL API.
+
+    Returns one entry per input, in order: either ``(repo, issues)`` shaped
+    like the ``fetch_repo``/``fetch_issues`` REST payloads, or an error
+    message for that repo. Requests are chunked into a few aliased queries;
+    a failed chunk marks each of its repos as failed.
+    """
+    chunks = [
+        repos[i : i + GRAPHQL_BATCH_SIZE]
+        for i in range(0, len(repos), GRAPHQL_BATCH_SIZE)
+    ]
+    async with httpx.AsyncClient() as client:
+        chunk_results = await asyncio.gather(
+            *(_fetch_repos_chunk(client, chunk) for chunk in chunks),
+            return_exceptions=True,
+        )
+
+    results = []
+    for chunk, chunk_result in zip(chunks, chunk_results):
+        if isinstance(chunk_result, Exception):
+            results.extend("GitHub request failed" for _ in chunk)
+        else:
+            results.extend(chunk_result)
+    return results
@@ -0,0 +1,241 @@
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from backend.config import settings
+from backend.dependencies import get_supabase_admin
+
+MAX_KEY_LENGTH = 255
+WAIT_TIMEOUT = 10.0
+POLL_INTERVAL = 0.1
+
+# Requests running in this process, keyed by (user_id, key). Duplicates that
+# arrive while the first is still running await its future instead of
+# touching the database. This only works because the blocking supabase calls
+# and the handler run in the threadpool, so the event loop is free to accept
+# the duplicates meanwhile.
+_in_flight: dict[tuple[str, str], tuple[str, asyncio.Future]] = {}
+
+
+def _request_hash(endpoint: str, payload: Any) -> str:
+    canonical = json.dumps([endpoint, payload], sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _replay(status_code: int, body: Any) -> Any:
+    if status_code >= 400:
+        raise HTTPException(status_code=status_code, detail=body["detail"])
+    return body
+
+
+def _mismatch() -> HTTPException:
+    return HTTPException(
+        status_code=422,
+        detail="Idempotency-Key was already used with a different request",
+    )
+
+
+async def run_idempotent(
+    user_id: str,
+    key: str | None,
+    endpoint: str,
+    payload: Any,
+    handler: Callable[[], Any],
+) -> Any:
+    """Run the blocking ``handler`` at most once per ``(user_id, key)``.
+
+    Without a key the handler simply runs. With one, the first request
+    claims the key, runs and stores its response; retries replay the stored
+    response. Reusing a key for a different ``endpoint``/``payload`` is a 422.
+
+    Only outcomes that would repeat are stored: successes and the 4xx
+    ``HTTPException``s the handler raises for business-rule failures. 5xx
+    and any other exception (e.g. a PostgREST timeout) release the key so a
+    retry runs again. Handlers must therefore not turn transport errors
+    into 4xx.
+    """
+    if key is None:
+        return await run_in_threadpool(handler)
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(status_code=400, detail="Invalid Idempotency-Key")
+
+    request_hash = _request_hash(endpoint, payload)
+    slot = (user_id, key)
+
+    running = _in_flight.get(slot)
+    if running is not None:
+        running_hash, future = running
+        if running_hash != request_hash:
+            raise _mismatch()
+        status_code, body = await asyncio.shield(future)
+        return _replay(status_code, body)
+
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[slot] = (request_hash, future)
+    try:
+        result = await _claim_and_run(user_id, key, endpoint, request_hash, handler)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()  # waiters re-raise it; don't warn if there are none
+        raise
+    else:
+        future.set_result(result)
+    finally:
+        del _in_flight[slot]
+
+    return _replay(*result)
+
+
+def _claim_row(user_id: str, key: str, endpoint: str, request_hash: str) -> dict:
+    now = datetime.now(timezone.utc)
+    return {
+        "user_id": user_id,
+        "key": key,
+        "endpoint": endpoint,
+        "request_hash": request_hash,
+        "status_code": None,
+        "response": None,
+        "locked_at": now.isoformat(),
+        "expires_at": (
+            now + timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS)
+        ).isoformat(),
+    }
+
+
+async def _claim_and_run(
+    user_id: str,
+    key: str,
+    endpoint: str,
+    request_hash: str,
+    handler: Callable[[], Any],
+) -> tuple[int, Any]:
+    sb = get_supabase_admin()
+    claim = _claim_row(user_id, key, endpoint, request_hash)
+
+    try:
+        await run_in_threadpool(sb.table("idempotency_keys").insert(claim).execute)
+    except Exception as e:
+        if "duplicate" not in str(e).lower():
+            raise
+        stored = await _wait_for_stored(user_id, key, endpoint, request_hash)
+        if stored is not None:
+            return stored
+
+    try:
+        body = await run_in_threadpool(handler)
+        status_code = 200
+    except HTTPException as e:
+        if e.status_code >= 500:
+            await _release(user_id, key)
+            raise
+        status_code, body = e.status_code, {"detail": e.detail}
+    except BaseException:
+        await _release(user_id, key)
+        raise
+
+    await run_in_threadpool(
+        sb.table("idempotency_keys")
+        .update({"status_code": status_code, "response": body, "locked_at": None})
+        .eq("user_id", user_id)
+        .eq("key", key)
+        .execute
+    )
+    return status_code, body
+
+
+async def _wait_for_stored(
+    user_id: str, key: str, endpoint: str, request_hash: str
+) -> tuple[int, Any] | None:
+    """Wait for an existing claim on the key to finish.
+
+    Returns the stored ``(status_code, body)``, or ``None`` once this
+    request holds the claim: the row was released, its replay TTL expired,
+    or its in-progress lease ran out (the owner died mid-request).
+    """
+    sb = get_supabase_admin()
+    deadline = asyncio.get_running_loop().time() + WAIT_TIMEOUT
+
+    while True:
+        result = await run_in_threadpool(
+            sb.table("idempotency_keys")
+            .select("request_hash, status_code, response, locked_at, expires_at")
+            .eq("user_id", user_id)
+            .eq("key", key)
+            .execute
+        )
+        now = datetime.now(timezone.utc)
+        claim = _claim_row(user_id, key, endpoint, request_hash)
+
+        if not result.data:
+            try:
+                await run_in_threadpool(
+                    sb.table("idempotency_keys").insert(claim).execute
+                )
+                return None
+            except Exception as e:
+                if "duplicate" not in str(e).lower():
+                    raise
+                continue
+
+        row = result.data[0]
+        if datetime.fromisoformat(row["expires_at"]) < now:
+            if await _take_over(claim, "expires_at", now):
+                return None
+            continue
+        if row["request_hash"] != request_hash:
+            raise _mismatch()
+        if row["status_code"] is not None:
+            return row["status_code"], row["response"]
+
+        lease_cutoff = now - timedelta(seconds=settings.IDEMPOTENCY_LEASE_SECONDS)
+        if datetime.fromisoformat(row["locked_at"]) < lease_cutoff:
+            if await _take_over(claim, "locked_at", lease_cutoff):
+                return None
+            continue
+
+        if asyncio.get_running_loop().time() >= deadline:
+            raise HTTPException(
+                status_code=409,
+                detail="A request with this Idempotency-Key is still in progress",
+            )
+        await asyncio.sleep(POLL_INTERVAL)
+
+
+async def _take_over(claim: dict, column: str, cutoff: datetime) -> bool:
+    """Reclaim the row if ``column`` is still older than ``cutoff``.
+
+    The filter makes this a compare-and-set: of several retries racing for
+    an abandoned claim, only one update matches the row.
+    """
+    query = (
+        get_supabase_admin()
+        .table("idempotency_keys")
+        .update(claim)
+        .eq("user_id", claim["user_id"])
+        .eq("key", claim["key"])
+        .lt(column, cutoff.isoformat())
+    )
+    if column == "locked_at":
+        query = query.is_("status_code", "null")
+    result = await run_in_threadpool(query.execute)
+    return bool(result.data)
+
+
+async def _release(user_id: str, key: str) -> None:
+    """Drop an unfinished claim so the client can retry with the same key."""
+    await run_in_threadpool(
+        get_supabase_admin()
+        .table("idempotency_keys")
+        .delete()
+        .eq("user_id", user_id)
+        .eq("key", key)
+        .execute
+    )
@@ -0,0 +1,94 @@
+"""Micro-benchmark: default FastAPI JSON path vs lean models + FastJSONResponse.
+
+Run with ``python bench_serialization.py``. Uses synthetic bounty feeds
+shaped like ``select("*, repos(*), profiles(*)")`` rows; no network needed.
+"""
+
+import gzip
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from backend.responses import FastJSONResponse
+from backend.schemas import BountyOut
+
+SIZES = [10, 100, 1000, 5000]
+
+feed_adapter = TypeAdapter(list[BountyOut])
+
+
+def make_bounty(i: int) -> dict:
+    ts = "2026-01-01T12:00:00.000000+00:00"
+    return {
+        "id": i,
+        "repo_id": i % 50,
+        "issue_number": i,
+        "issue_title": f"Fix flaky test in module {i} when running under load",
+        "issue_url": f"https://github.com/acme/widgets/issues/{i}",
+        "creator_id": "5f1c9a52-3b7e-4d8e-9a0f-2c6b1e7d4a10",
+        "amount": 25 + i % 200,
+        "status": "open",
+        "created_at": ts,
+        "updated_at": ts,
+        "repos": {
+            "id": i % 50,
+            "github_id": 100000 + i % 50,
+            "owner": "acme",
+            "name": "widgets",
+            "full_name": "acme/widgets",
+            "description": "A collection of reusable widgets for web apps",
+            "stars": 1234,
+            "language": "TypeScript",
+            "url": "https://github.com/acme/widgets",
+            "created_at": ts,
+        },
+        "profiles": {
+            "id": "5f1c9a52-3b7e-4d8e-9a0f-2c6b1e7d4a10",
+            "username": "alice-dev",
+            "avatar_url": "https://api.dicebear.com/9.x/avataaars/svg?seed=alice",
+            "github_username": "alice-dev",
+            "balance": 1000,
+            "created_at": ts,
+            "updated_at": ts,
+        },
+    }
+
+
+def default_path(rows: list[dict]) -> bytes:
+    return JSONResponse(jsonable_encoder(rows)).body
+
+
+def fast_path(rows: list[dict]) -> bytes:
+    lean = feed_adapter.dump_python(feed_adapter.validate_python(rows), mode="json")
+    return FastJSONResponse(lean).body
+
+
+def bench(fn, rows: list[dict]) -> float:
+    number = max(1, 2000 // len(rows))
+    best = min(timeit.repeat(lambda: fn(rows), number=number, repeat=5))
+    return best / number * 1000
+
+
+def main():
+    print(
+        f"{'rows':>6} {'default ms':>11} {'fast ms':>9} {'speedup':>8}"
+        f" {'default B':>10} {'fast B':>9} {'fast gz B':>10}"
+    )
+    for size in SIZES:
+        rows = [make_bounty(i) for i in range(size)]
+        default_ms = bench(default_path, rows)
+        fast_ms = bench(fast_path, rows)
+        default_body = default_path(rows)
+        fast_body = fast_path(rows)
+        print(
+            f"{size:>6} {default_ms:>11.3f} {fast_ms:>9.3f}"
+            f" {default_ms / fast_ms:>7.1f}x"
+            f" {len(default_body):>10} {len(fast_body):>9}"
+            f" {len(gzip.compress(fast_body)):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,20 @@ export function setAccessToken(token: string | null) {
   _accessToken = token
 }
 
+// Short-lived token the backend returns after a write. Echoing it keeps our
+// reads on the primary database so we see our own changes.
+const LAST_WRITE_HEADER = 'X-Last-Write'
+let _lastWriteToken: string | null = null
+
+function lastWriteHeaders(): Record<string, string> {
+  return _lastWriteToken ? { [LAST_WRITE_HEADER]: _lastWriteToken } : {}
+}
+
+function rememberLastWrite(res: Response) {
+  const token = res.headers.get(LAST_WRITE_HEADER)
+  if (token) _lastWriteToken = token
+}
+
 async function getAuthHeaders(): Promise<Record<string, string>> {
   if (_accessToken) {
     return { Authorization: `Bearer ${_accessToken}` }
@@ -29,9 +43,11 @@ async function apiFetch<T>(path: string, options: RequestInit = {}): Promise<T>
     headers: {
       'Content-Type': 'application/json',
       ...authHeaders,
+      ...lastWriteHeaders(),
       ...options.headers,
     },
   })
+  rememberLastWrite(res)
 
   // If 401 and we had a token, it probably expired — refresh and retry once
   if (res.status === 401 && _accessToken) {
@@ -44,9 +60,11 @@ async function apiFetch<T>(path: string, options: RequestInit = {}): Promise<T>
         headers: {
           'Content-Type': 'application/json',
           Authorization: `Bearer ${session.access_token}`,
+          ...lastWriteHeaders(),
           ...options.headers,
         },
       })
+      rememberLastWrite(retry)
       if (!retry.ok) {
         const error = await retry.json().catch(() => ({ detail: 'Request failed' }))
         throw new Error(error.detail || `HTTP ${retry.status}`)
@@ -62,10 +80,20 @@ async function apiFetch<T>(path: string, options: RequestInit = {}): Promise<T>
   return res.json()
 }
 
+// One key per logical call, shared by the 401 retry above, so the backend
+// never runs a money-moving request twice
+function idempotencyHeaders(): Record<string, string> {
+  return { 'Idempotency-Key': crypto.randomUUID() }
+}
+
 export const api = {
   get: <T>(path: string) => apiFetch<T>(path),
   post: <T>(path: string, body: unknown) =>
-    apiFetch<T>(path, { method: 'POST', body: JSON.stringify(body) }),
+    apiFetch<T>(path, {
+      method: 'POST',
+      body: JSON.stringify(body),
+      headers: idempotencyHeaders(),
+    }),
   delete: <T>(path: string) =>
-    apiFetch<T>(path, { method: 'DELETE' }),
+    apiFetch<T>(path, { method: 'DELETE', headers: idempotencyHeaders() }),
 }
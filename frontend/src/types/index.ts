@@ -67,10 +67,49 @@ export interface GitHubIssue {
   user: { login: string; avatar_url: string }
   created_at: string
   comments: number
-  bounty?: Bounty | null
+  bounty?: BountyRef | null
 }
 
 export interface RepoSearchResult {
   repo: Repo
   issues: GitHubIssue[]
 }
+
+// Lean shapes returned by the backend list endpoints (see backend/schemas.py).
+// Full rows above are what the Supabase client reads directly.
+
+export type ProfileSummary = Pick<Profile, 'id' | 'username' | 'avatar_url'>
+
+export type RepoSummary = Pick<Repo, 'id' | 'owner' | 'name' | 'full_name'>
+
+export type BountyRef = Pick<Bounty, 'id' | 'issue_number' | 'creator_id' | 'amount' | 'status'>
+
+// GET /api/bounties
+export interface BountySummary extends BountyRef {
+  repo_id: number
+  issue_title: string
+  issue_url: string
+  created_at: string
+  repos: RepoSummary | null
+  profiles: ProfileSummary | null
+}
+
+// GET /api/wallet
+export type WalletTransaction = Omit<Transaction, 'user_id'>
+
+export interface WalletResponse {
+  balance: number
+  transactions: WalletTransaction[]
+}
+
+// POST /api/repos/batch
+export interface BatchRepoResult {
+  query: string
+  repo: Repo | null
+  issues: GitHubIssue[]
+  error: string | null
+}
+
+export interface BatchRepoResponse {
+  results: BatchRepoResult[]
+}
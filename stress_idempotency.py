@@ -0,0 +1,84 @@
+"""Stress test: fire duplicate money-moving requests in parallel.
+
+Sends the same ``POST /api/bounties`` N times concurrently with one
+Idempotency-Key against a running API, then checks that every response is
+identical, that the bounty was placed, and that the wallet shows a single
+``bounty_placed`` transaction. Any other outcome exits non-zero.
+
+Bounties are unique per (repo, issue, creator), so each run needs an issue
+number the token's user has no bounty on yet. By default one is derived
+from the current time; pass ``--issue-number`` to pick it yourself.
+
+    python stress_idempotency.py --api http://localhost:8000/api \\
+        --token <supabase access token> --repo-id 1
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+
+async def fire(client: httpx.AsyncClient, args, key: str) -> tuple[int, dict]:
+    resp = await client.post(
+        f"{args.api}/bounties",
+        headers={"Idempotency-Key": key},
+        json={
+            "repo_id": args.repo_id,
+            "issue_number": args.issue_number,
+            "issue_title": f"Stress test issue #{args.issue_number}",
+            "issue_url": f"https://github.com/example/example/issues/{args.issue_number}",
+            "amount": args.amount,
+        },
+    )
+    return resp.status_code, resp.json()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--api", default="http://localhost:8000/api")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--repo-id", type=int, required=True)
+    parser.add_argument(
+        "--issue-number",
+        type=int,
+        default=int(time.time() * 1000) % 2_000_000_000,
+        help="issue to place the bounty on (default: unique per run)",
+    )
+    parser.add_argument("--amount", type=int, default=5)
+    parser.add_argument("-n", "--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    key = str(uuid.uuid4())
+    async with httpx.AsyncClient(
+        headers={"Authorization": f"Bearer {args.token}"}, timeout=30
+    ) as client:
+        responses = await asyncio.gather(
+            *(fire(client, args, key) for _ in range(args.requests))
+        )
+        wallet = (await client.get(f"{args.api}/wallet")).json()
+
+    distinct = {str(r) for r in responses}
+    print(f"{len(responses)} requests, {len(distinct)} distinct response(s)")
+    for r in distinct:
+        print(f"  {r}")
+
+    if len(distinct) != 1:
+        raise SystemExit("FAIL: duplicate requests got different responses")
+    status, body = responses[0]
+    if status != 200:
+        raise SystemExit(f"FAIL: request was rejected with {status}: {body}")
+    placed = [
+        t for t in wallet["transactions"]
+        if t["type"] == "bounty_placed" and t["bounty_id"] == body["id"]
+    ]
+    print(f"bounty_placed transactions for bounty {body['id']}: {len(placed)}")
+    if len(placed) != 1:
+        raise SystemExit("FAIL: duplicate requests were not deduplicated")
+    print("OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,158 @@
+-- ============================================================
+-- RPC helper: pay out a single submission on a locked bounty
+-- ============================================================
+-- Caller must already hold the row lock on the bounty and have checked
+-- that it is open and owned by the approver.
+CREATE OR REPLACE FUNCTION public._pay_out_submission(
+    p_bounty public.bounties,
+    p_submission public.submissions
+) RETURNS VOID AS $$
+BEGIN
+    UPDATE public.submissions SET status = 'approved' WHERE id = p_submission.id;
+    UPDATE public.submissions SET status = 'rejected'
+        WHERE bounty_id = p_bounty.id AND id != p_submission.id AND status = 'pending';
+    UPDATE public.bounties SET status = 'paid' WHERE id = p_bounty.id;
+    UPDATE public.profiles SET balance = balance + p_bounty.amount WHERE id = p_submission.solver_id;
+
+    INSERT INTO public.transactions (user_id, amount, type, bounty_id, description)
+    VALUES (p_submission.solver_id, p_bounty.amount, 'bounty_earned', p_bounty.id,
+            'Earned bounty for ' || p_bounty.issue_title);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+REVOKE ALL ON FUNCTION public._pay_out_submission(public.bounties, public.submissions)
+    FROM PUBLIC, anon, authenticated;
+
+-- ============================================================
+-- RPC: approve_submission (atomic) -- now shares the payout helper
+-- ============================================================
+CREATE OR REPLACE FUNCTION public.approve_submission(
+    p_approver_id UUID,
+    p_bounty_id BIGINT,
+    p_submission_id BIGINT
+) RETURNS VOID AS $$
+DECLARE
+    v_bounty public.bounties;
+    v_submission public.submissions;
+BEGIN
+    SELECT * INTO v_bounty FROM public.bounties WHERE id = p_bounty_id FOR UPDATE;
+    IF v_bounty.id IS NULL THEN
+        RAISE EXCEPTION 'Bounty not found';
+    END IF;
+    IF v_bounty.creator_id != p_approver_id THEN
+        RAISE EXCEPTION 'Only the bounty creator can approve submissions';
+    END IF;
+    IF v_bounty.status != 'open' THEN
+        RAISE EXCEPTION 'Bounty is not open';
+    END IF;
+
+    SELECT * INTO v_submission FROM public.submissions
+        WHERE id = p_submission_id AND bounty_id = p_bounty_id;
+    IF v_submission.id IS NULL THEN
+        RAISE EXCEPTION 'Submission not found';
+    END IF;
+
+    PERFORM public._pay_out_submission(v_bounty, v_submission);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- The function trusts p_approver_id, so only the service role may call it.
+REVOKE EXECUTE ON FUNCTION public.approve_submission(UUID, BIGINT, BIGINT)
+    FROM PUBLIC, anon, authenticated;
+
+-- ============================================================
+-- RPC: moderate_submissions (bulk approve/reject, atomic)
+-- ============================================================
+-- p_actions is a JSON array of {"submission_id": <id>, "action": "approve" | "reject"}.
+-- The bounty is locked once and ownership is checked once. Rejections are
+-- applied in a single set-based UPDATE. At most one approval is allowed; it
+-- pays out the bounty and auto-rejects every other pending submission.
+-- Returns a JSON array of {"submission_id", "action", "ok", "error"} in input order.
+CREATE OR REPLACE FUNCTION public.moderate_submissions(
+    p_moderator_id UUID,
+    p_bounty_id BIGINT,
+    p_actions JSONB
+) RETURNS JSONB AS $$
+DECLARE
+    v_bounty public.bounties;
+    v_submission public.submissions;
+    v_approve_id BIGINT;
+    v_results JSONB;
+BEGIN
+    SELECT * INTO v_bounty FROM public.bounties WHERE id = p_bounty_id FOR UPDATE;
+    IF v_bounty.id IS NULL THEN
+        RAISE EXCEPTION 'Bounty not found';
+    END IF;
+    IF v_bounty.creator_id != p_moderator_id THEN
+        RAISE EXCEPTION 'Only the bounty creator can moderate submissions';
+    END IF;
+    IF v_bounty.status != 'open' THEN
+        RAISE EXCEPTION 'Bounty is not open';
+    END IF;
+
+    CREATE TEMP TABLE _moderation (
+        ord INTEGER NOT NULL,
+        submission_id BIGINT NOT NULL,
+        action TEXT NOT NULL,
+        ok BOOLEAN NOT NULL DEFAULT false,
+        error TEXT
+    ) ON COMMIT DROP;
+
+    INSERT INTO _moderation (ord, submission_id, action)
+    SELECT a.ord, (a.item->>'submission_id')::BIGINT, a.item->>'action'
+    FROM jsonb_array_elements(p_actions) WITH ORDINALITY AS a(item, ord);
+
+    IF (SELECT count(*) FROM _moderation WHERE action = 'approve') > 1 THEN
+        RAISE EXCEPTION 'Only one submission can be approved';
+    END IF;
+
+    -- Per-item validation: unknown action, repeated id, foreign submission,
+    -- already decided.
+    UPDATE _moderation m SET error = 'Invalid action'
+        WHERE m.action NOT IN ('approve', 'reject');
+    UPDATE _moderation m SET error = 'Duplicate submission'
+        WHERE m.error IS NULL AND EXISTS (
+            SELECT 1 FROM _moderation d
+            WHERE d.submission_id = m.submission_id AND d.ord < m.ord
+        );
+    UPDATE _moderation m SET error = 'Submission not found'
+        WHERE m.error IS NULL AND NOT EXISTS (
+            SELECT 1 FROM public.submissions s
+            WHERE s.id = m.submission_id AND s.bounty_id = p_bounty_id
+        );
+    UPDATE _moderation m SET error = 'Submission is not pending'
+        FROM public.submissions s
+        WHERE m.error IS NULL AND s.id = m.submission_id AND s.status != 'pending';
+
+    UPDATE public.submissions s SET status = 'rejected'
+        FROM _moderation m
+        WHERE m.error IS NULL AND m.action = 'reject'
+          AND s.id = m.submission_id AND s.bounty_id = p_bounty_id;
+    UPDATE _moderation SET ok = true WHERE error IS NULL AND action = 'reject';
+
+    SELECT submission_id INTO v_approve_id FROM _moderation
+        WHERE error IS NULL AND action = 'approve';
+    IF v_approve_id IS NOT NULL THEN
+        SELECT * INTO v_submission FROM public.submissions
+            WHERE id = v_approve_id AND bounty_id = p_bounty_id;
+        PERFORM public._pay_out_submission(v_bounty, v_submission);
+        UPDATE _moderation SET ok = true WHERE submission_id = v_approve_id AND action = 'approve';
+    END IF;
+
+    SELECT COALESCE(jsonb_agg(
+        jsonb_build_object(
+            'submission_id', submission_id,
+            'action', action,
+            'ok', ok,
+            'error', error
+        ) ORDER BY ord
+    ), '[]'::jsonb) INTO v_results FROM _moderation;
+
+    DROP TABLE _moderation;
+    RETURN v_results;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- The function trusts p_moderator_id, so only the service role may call it.
+REVOKE EXECUTE ON FUNCTION public.moderate_submissions(UUID, BIGINT, JSONB)
+    FROM PUBLIC, anon, authenticated;
@@ -0,0 +1,56 @@
+-- ============================================================
+-- IDEMPOTENCY_KEYS: replay store for money-moving endpoints
+-- ============================================================
+-- A row is claimed (status_code NULL, locked_at set) before the request runs
+-- and filled in with the response afterwards. Duplicates with the same key
+-- replay the stored response instead of running the operation again.
+-- locked_at is a short lease: an unfinished claim older than the lease
+-- (e.g. the function was killed mid-request) may be taken over by a retry.
+-- expires_at only bounds how long a finished response is replayed.
+CREATE TABLE public.idempotency_keys (
+    user_id UUID NOT NULL REFERENCES public.profiles(id) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    request_hash TEXT NOT NULL,
+    status_code INTEGER,
+    response JSONB,
+    locked_at TIMESTAMPTZ,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    expires_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (user_id, key)
+);
+
+CREATE INDEX idx_idempotency_keys_expires_at ON public.idempotency_keys(expires_at);
+
+-- Service role only; no client policies.
+ALTER TABLE public.idempotency_keys ENABLE ROW LEVEL SECURITY;
+
+-- ============================================================
+-- TTL cleanup
+-- ============================================================
+CREATE OR REPLACE FUNCTION public.purge_expired_idempotency_keys()
+RETURNS INTEGER AS $$
+DECLARE
+    v_deleted INTEGER;
+BEGIN
+    DELETE FROM public.idempotency_keys WHERE expires_at < now();
+    GET DIAGNOSTICS v_deleted = ROW_COUNT;
+    RETURN v_deleted;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION public.purge_expired_idempotency_keys()
+    FROM PUBLIC, anon, authenticated;
+
+-- Run hourly when pg_cron is enabled (Database > Extensions in Supabase).
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+        PERFORM cron.schedule(
+            'purge-expired-idempotency-keys',
+            '0 * * * *',
+            'SELECT public.purge_expired_idempotency_keys()'
+        );
+    END IF;
+END;
+$$;
@@ -0,0 +1,55 @@
+-- ============================================================
+-- REPLICATION_HEARTBEAT: primary-written clock for replica freshness
+-- ============================================================
+-- The primary bumps beat_at every couple of seconds. On a standby the row
+-- is only as new as the WAL it has replayed, so now() - beat_at is how far
+-- behind the primary it is. This keeps growing when the standby loses its
+-- connection, unlike comparing its own receive/replay LSNs.
+CREATE TABLE public.replication_heartbeat (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    beat_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+INSERT INTO public.replication_heartbeat (id) VALUES (1);
+
+-- Service role only; no client policies.
+ALTER TABLE public.replication_heartbeat ENABLE ROW LEVEL SECURITY;
+
+-- Beat every 2 seconds when pg_cron is enabled (Database > Extensions in
+-- Supabase). Without it the heartbeat never advances, so the replica looks
+-- stale and every read stays on the primary.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+        PERFORM cron.schedule(
+            'replication-heartbeat',
+            '2 seconds',
+            'UPDATE public.replication_heartbeat SET beat_at = now() WHERE id = 1'
+        );
+    END IF;
+END;
+$$;
+
+-- ============================================================
+-- RPC: replica_lag_seconds
+-- ============================================================
+-- Called on the read replica by the API to decide whether a read may be
+-- served there. Returns 0 on the primary, otherwise the age of the last
+-- replayed heartbeat (at least the heartbeat interval). NULL means the
+-- heartbeat row has not reached this standby.
+CREATE OR REPLACE FUNCTION public.replica_lag_seconds()
+RETURNS DOUBLE PRECISION AS $$
+BEGIN
+    IF NOT pg_is_in_recovery() THEN
+        RETURN 0;
+    END IF;
+    RETURN (
+        SELECT EXTRACT(EPOCH FROM now() - beat_at)
+        FROM public.replication_heartbeat
+        WHERE id = 1
+    );
+END;
+$$ LANGUAGE plpgsql STABLE SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION public.replica_lag_seconds()
+    FROM PUBLIC, anon, authenticated;
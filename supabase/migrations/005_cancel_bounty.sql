@@ -0,0 +1,37 @@
+-- ============================================================
+-- RPC: cancel_bounty (atomic)
+-- ============================================================
+-- Locks the bounty, checks owner and status, refunds the creator and writes
+-- the ledger row in one transaction, so a retried or concurrent cancel can
+-- never refund twice.
+CREATE OR REPLACE FUNCTION public.cancel_bounty(
+    p_canceller_id UUID,
+    p_bounty_id BIGINT
+) RETURNS VOID AS $$
+DECLARE
+    v_bounty public.bounties;
+BEGIN
+    SELECT * INTO v_bounty FROM public.bounties WHERE id = p_bounty_id FOR UPDATE;
+    IF v_bounty.id IS NULL THEN
+        RAISE EXCEPTION 'Bounty not found';
+    END IF;
+    IF v_bounty.creator_id != p_canceller_id THEN
+        RAISE EXCEPTION 'Not your bounty';
+    END IF;
+    IF v_bounty.status != 'open' THEN
+        RAISE EXCEPTION 'Bounty is not open';
+    END IF;
+
+    UPDATE public.bounties SET status = 'cancelled' WHERE id = p_bounty_id;
+    UPDATE public.profiles SET balance = balance + v_bounty.amount
+        WHERE id = v_bounty.creator_id;
+
+    INSERT INTO public.transactions (user_id, amount, type, bounty_id, description)
+    VALUES (v_bounty.creator_id, v_bounty.amount, 'bounty_cancelled', p_bounty_id,
+            'Cancelled bounty on ' || v_bounty.issue_title);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- The function trusts p_canceller_id, so only the service role may call it.
+REVOKE EXECUTE ON FUNCTION public.cancel_bounty(UUID, BIGINT)
+    FROM PUBLIC, anon, authenticated;